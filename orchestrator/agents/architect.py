@@ -2,31 +2,38 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Any
-import yaml
 from orchestrator.llm import LLM
+from orchestrator.yaml_io import safe_load
+from orchestrator.proposals import proposal_from_data
 from orchestrator.task_logging import TaskLog
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BootstrapResult:
   updated_files: list[str]
   problems: list[str]
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ArchitectContext:
   """Контекст для работы архитектора с расширенной документацией."""
   docs_content: Dict[str, str]  # Имя файла -> содержимое
   repo_path: str
   total_docs: int
+  docs_summary: str  # вся документация одним текстом, собирается один раз
 
 def create_architect_context(docs_content: Dict[str, str], repo: Path) -> ArchitectContext:
   """Создает контекст архитектора с собранной документацией."""
+  docs_summary = "\n\n".join([
+    f"=== {file_path} ===\n{content}"
+    for file_path, content in docs_content.items()
+  ])
   return ArchitectContext(
     docs_content=docs_content,
     repo_path=str(repo),
-    total_docs=len(docs_content)
+    total_docs=len(docs_content),
+    docs_summary=docs_summary
   )
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ArchitectResult:
   """Результат работы архитектора с полным контекстом."""
   proposal_yaml: str
@@ -48,48 +55,17 @@ def ask_user_questions(questions: list[str]) -> list[str]:
   """Задает вопросы пользователю и собирает ответы."""
   answers = []
 
-  print("\n" + "=" * 50)
-  print("ARCHITECT HAS QUESTIONS FOR YOU")
-  print("=" * 50)
+  rule = "=" * 50
+  print(f"\n{rule}\nARCHITECT HAS QUESTIONS FOR YOU\n{rule}")
 
   for i, question in enumerate(questions, 1):
-    print(f"\nQ{i}: {question}")
-    answer = input("A: ").strip()
+    # the question goes out as part of the prompt, one write per question
+    answer = input(f"\nQ{i}: {question}\nA: ").strip()
     answers.append(answer)
 
   return answers
 
-def run_architect_with_context(architect_context: ArchitectContext, user_input: Dict[str, str], llm: LLM, log: TaskLog) -> ArchitectResult:
-  """Запускает архитектора с полным контекстом и описанием задачи пользователя."""
-
-  # Собираем весь контекст документации в один текст
-  docs_summary = "\n\n".join([
-    f"=== {file_path} ===\n{content}"
-    for file_path, content in architect_context.docs_content.items()
-  ])
-
-  task_description = user_input.get('task_description', '')
-
-  questions_and_answers = []
-  round_count = 0
-
-  while True:
-    round_count += 1
-
-    # Формируем промпт с историей Q&A
-    qa_history = ""
-    if questions_and_answers:
-      qa_history = "\n\nPrevious Q&A from this session:\n"
-      for q, a in questions_and_answers:
-        qa_history += f"Q: {q}\nA: {a}\n\n"
-
-    user_prompt = f"""Current project documentation:
-{docs_summary}
-
-User task description:
-{task_description}{qa_history}
-
-Your task:
+INSTRUCTIONS = """Your task:
 1) Analyze the user's task in context of existing documentation
 2) If you need clarification, ask specific questions using 'questions' key
 3) If ready to propose changes, use 'proposed_changes' and 'tasks' keys
@@ -104,18 +80,61 @@ OR
 - problems: [list of any blocking issues]
 """
 
-    output = llm.text(SYSTEM, user_prompt)
-    log.write_text(f"architect_round_{round_count}.yaml", output)
+def run_architect_with_context(architect_context: ArchitectContext, user_input: Dict[str, str], llm: LLM, log: TaskLog) -> ArchitectResult:
+  """Запускает архитектора с полным контекстом и описанием задачи пользователя.
+
+  llm должен быть создан с системным промптом SYSTEM.
+  """
+
+  # Документация и описание задачи не меняются между раундами и идут первыми,
+  # чтобы провайдер мог переиспользовать закэшированный префикс промпта
+  prompt_context = {
+    "Current project documentation": architect_context.docs_summary,
+    "User task description": user_input.get('task_description', ''),
+  }
+
+  questions_and_answers = []
+  round_count = 0
+  current_request = INSTRUCTIONS
+  parse_failed = False
+
+  while True:
+    round_count += 1
+
+    # после ошибки разбора не берем ответ из кэша, чтобы не зациклиться на испорченной записи
+    parts = []
+    with log.open_text(f"architect_round_{round_count}.yaml") as f:
+      for chunk in llm.text_stream(prompt_context, current_request, bypass_cache=parse_failed):
+        f.write(chunk)
+        parts.append(chunk)
+    output = "".join(parts)
+    parse_failed = False
 
+    # Один разбор на раунд: по результату решаем, вопросы это или финальное предложение
     try:
-      response_data = yaml.safe_load(output) or {}
+      response_data = safe_load(output) or {}
     except Exception as e:
       log.write_text(f"architect_round_{round_count}_error.txt", str(e))
       print(f"[ERROR] Invalid YAML response in round {round_count}: {e}")
+      current_request = f"Failed to parse your response as YAML: {e}\nReturn valid YAML only, following the format above."
+      parse_failed = True
+      llm.discard_cached_response()
       continue
+    questions = response_data.get("questions", []) if isinstance(response_data, dict) else []
+
+    # финальное предложение проверяем по уже разобранным данным, ошибку возвращаем архитектору
+    if not questions:
+      try:
+        proposal_from_data(response_data)
+      except ValueError as e:
+        log.write_text(f"architect_round_{round_count}_error.txt", str(e))
+        print(f"[ERROR] Invalid proposal in round {round_count}: {e}")
+        current_request = f"Your proposal is invalid: {e}\nFix it and return valid YAML only, following the format above."
+        parse_failed = True
+        llm.discard_cached_response()
+        continue
 
     # Проверяем есть ли вопросы
-    questions = response_data.get("questions", [])
     if questions:
       print(f"\n[ROUND {round_count}] Architect has {len(questions)} question(s)")
       answers = ask_user_questions(questions)
@@ -124,6 +143,11 @@ OR
       for q, a in zip(questions, answers):
         questions_and_answers.append((q, a))
 
+      # Предыдущие раунды уже есть в истории чата, отправляем только новые ответы;
+      # если LLM уже выбросил старые ходы из чата, отправляем все ответы заново
+      answered = questions_and_answers if llm.dropped_turns else list(zip(questions, answers))
+      qa_round = "".join(f"Q: {q}\nA: {a}\n\n" for q, a in answered)
+      current_request = f"Answers to your questions:\n{qa_round}"
       continue
 
     # Если вопросов нет - это финальное предложение
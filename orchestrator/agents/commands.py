@@ -0,0 +1,112 @@
+from __future__ import annotations
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from orchestrator.bash_tools import cat, ls, tree, grep, TREE_TRUNCATED
+from orchestrator.execution_context import Context
+
+
+MAX_PARALLEL_COMMANDS = 8
+
+# Each handler parses the command arguments and returns (context key, log header, action),
+# or raises ValueError with the message for the LLM when the arguments are malformed.
+def _ls_command(args: str):
+  path = args.strip()
+  return f"LS_OUTPUT {path}", f"ls {path}", partial(ls, path)
+
+def _cat_command(args: str):
+  parts = args.split()
+  if len(parts) == 3 and parts[1].isdigit() and parts[2].isdigit():
+    path, first, last = parts[0], int(parts[1]), int(parts[2])
+    if first < 1 or last < first:
+      raise ValueError(f"Invalid line range in cat command: cat {args}. Use 1 <= first line <= last line.")
+    return f"CAT_OUTPUT {path} {first} {last}", f"cat {path} {first} {last}", partial(cat, path, first, last)
+  path = args.strip()
+  return f"CAT_OUTPUT {path}", f"cat {path}", partial(cat, path)
+
+_TREE_ARGS = re.compile(r"(\S+)\s+(-?\d+)")
+_GREP_ARGS = re.compile(r"(\S+)(?:\s+(.+))?", re.S)
+
+def _tree_command(args: str):
+  m = _TREE_ARGS.fullmatch(args.strip())
+  if m is None:
+    if len(args.split()) != 2:
+      raise ValueError(f"Invalid tree command: tree {args}. Please use the format: tree <path> <depth>.")
+    raise ValueError(f"Invalid depth in tree command: tree {args}. Depth must be an integer.")
+  path, depth = m[1], int(m[2])
+  return f"TREE_OUTPUT {path} {depth}", f"tree {path} {depth}", partial(tree, path, depth)
+
+def _grep_command(args: str):
+  m = _GREP_ARGS.fullmatch(args.strip())
+  if m is None:
+    raise ValueError(f"Invalid grep command: grep {args}. Please use the format: grep <path> <pattern>.")
+  path, pattern = m[1], m[2] or ""
+  return f"GREP_OUTPUT {path} {pattern}", f"grep {path} {pattern}", partial(grep, path, pattern)
+
+COMMANDS = {
+  "ls": _ls_command,
+  "cat": _cat_command,
+  "tree": _tree_command,
+  "grep": _grep_command,
+}
+
+def already_in_context(context: Context, log_name: str, command: str) -> str:
+  # files do not change during a task, so a repeated command would only duplicate its output
+  context.write_text(log_name, f"{command}\n<already in context, not executed>")
+  return f"The output of `{command}` is already in the context. Do not request it again."
+
+def run_commands(context: Context, commands: list[str], log_name: str) -> tuple[int, str | None]:
+  # returns the number of executed commands and a message for the LLM if some command was rejected
+  request = None
+  pending = {}  # context key -> (log header, action), in request order
+  for command in commands:
+    name, _, args = command.partition(" ")
+    handler = COMMANDS.get(name)
+    if handler is None:
+      context.write_text(log_name, f"Invalid command: {command}")
+      request = f"Invalid command: {command}. Please use only the allowed commands: ls, cat, tree, grep."
+      break
+    try:
+      key, header, run = handler(args)
+    except ValueError as e:
+      context.write_text(log_name, str(e))
+      request = str(e)
+      break
+    if key in context.prompt_context or key in pending:
+      request = already_in_context(context, log_name, command)
+      continue
+    pending[key] = (header, run)
+  # the tools only read the repo, so a batch can run concurrently; results are stored in request order
+  if len(pending) > 1:
+    with ThreadPoolExecutor(max_workers=min(len(pending), MAX_PARALLEL_COMMANDS)) as pool:
+      results = list(pool.map(lambda item: item[1](), pending.values()))
+  else:
+    results = [run() for _, run in pending.values()]
+  for (key, (header, _)), result in zip(pending.items(), results):
+    context.prompt_context[key] = result
+    context.write_text(log_name, f"{header}\n{result}")
+  if any(key.startswith("TREE_OUTPUT ") for key in pending):
+    _drop_superseded_listings(context.prompt_context)
+  if pending:
+    context.trim_prompt_context()
+  return len(pending), request
+
+def _drop_superseded_listings(prompt_context: dict[str, str]):
+  # a complete tree of a directory contains its shallower trees and, from depth 1, its ls;
+  # truncated or failed trees do not supersede anything
+  deepest: dict[str, int] = {}
+  for key, value in prompt_context.items():
+    if key.startswith("TREE_OUTPUT ") and value and value != "<FORBIDDEN>" and TREE_TRUNCATED not in value:
+      path, _, depth = key[len("TREE_OUTPUT "):].rpartition(" ")
+      path = os.path.normpath(path)
+      deepest[path] = max(deepest.get(path, -1), int(depth))
+  for key in list(prompt_context):
+    if key.startswith("TREE_OUTPUT "):
+      path, _, depth = key[len("TREE_OUTPUT "):].rpartition(" ")
+      if int(depth) < deepest.get(os.path.normpath(path), -1):
+        del prompt_context[key]
+    elif key.startswith("LS_OUTPUT "):
+      if deepest.get(os.path.normpath(key[len("LS_OUTPUT "):]), 0) >= 1:
+        del prompt_context[key]
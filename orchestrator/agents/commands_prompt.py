@@ -0,0 +1,17 @@
+# Exploration commands section shared by the developer and reviewer system prompts
+COMMANDS_PROMPT = """Available Commands (STRICT, FOR EXPLORATION ONLY)
+You may respond with commands ONLY until you produce the final JSON.
+
+Allowed commands:
+* ls <path>
+* tree <path> <depth>
+* cat <full relative path>
+* cat <full relative path> <first line> <last line>  (1-based, inclusive)
+* grep <path> <pattern>
+
+Rules for commands:
+* No explanations, comments, markdown, or extra text
+* Paths must exist and be within the current directory
+* Never reference or assume files or directories that do not exist
+* Long files are shown with a middle part omitted; read omitted lines with the line-range form of cat
+"""
@@ -1,3 +1,5 @@
+from orchestrator.agents.commands_prompt import COMMANDS_PROMPT
+
 SYSTEM_PROMPT = """
 Role
 You are a developer AI operating inside a constrained code-modification environment.
@@ -14,23 +16,10 @@ Rules for JSON output:
 
 ---
 
-Available Commands (STRICT, FOR EXPLORATION ONLY)
-You may respond with commands ONLY until you produce the final JSON.
-
-Allowed commands:
-* ls <path>
-* tree <path> <depth>
-* cat <full relative path>
-* grep <path> <pattern>
-
-Rules for commands:
-* No explanations, comments, markdown, or extra text
-* Paths must exist and be within the current directory
-* Never reference or assume files or directories that do not exist
----
+""" + COMMANDS_PROMPT + """---
 Code Inspection Rules
 * Always inspect files (`cat`) before modifying them
-* A file can be read (`cat`) only once
+* A file (or a line range of it) can be read (`cat`) only once
 * Prefer `tree <path> 2` or `tree <path> 3` over multiple `ls` calls
 * Do not infer file contents you have not read
 
@@ -0,0 +1,65 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from orchestrator import json_io
+from orchestrator.llm import LLM
+from orchestrator.execution_context import Context
+from orchestrator.agents.commands import run_commands
+
+# the step counter is shared by the whole task, so this bounds the developer and reviewer together
+MAX_STEPS = 40
+
+# identical responses (cache hits, repeated retries) are parsed once; results are treated as read-only
+_parse_response = lru_cache(maxsize=32)(json_io.loads_leading)
+
+
+class ExploringAgent(ABC):
+  # Shared loop of the developer and the reviewer: ask the LLM, run the exploration commands
+  # it requests, and hand the final response to on_complete.
+  log_name = "agent.txt"
+  final_log_name = "agent_final.txt"
+  exceeded_message = "Exceeded maximum number of steps."
+
+  def __init__(self, llm: LLM):
+    self.llm = llm
+
+  @abstractmethod
+  def on_complete(self, context: Context, response: dict) -> str | None:
+    # returns a corrective request for the LLM if the response is not acceptable, None to stop
+    ...
+
+  def run_loop(self, context: Context, task_request: str):
+    # corrections and notices are sent for one turn; afterwards the LLM gets task_request again
+    current_request = task_request
+    parse_failed = False
+    while True:
+      if context.step > MAX_STEPS:
+        context.write_text(self.final_log_name, self.exceeded_message)
+        break
+      try:
+        raw_response = self.llm.text(context.prompt_context, current_request, bypass_cache=parse_failed)
+        current_request = task_request
+        parse_failed = False
+        response = _parse_response(raw_response)
+        context.write_json(self.log_name, {"LLM Response": response})
+      except json_io.JSONDecodeError as e:
+        context.write_text(self.log_name, f"Failed to parse LLM response as JSON: {e}\nResponse was:\n{raw_response}")
+        current_request = f"Failed to parse your response as JSON: {e}\nPlease ensure your response strictly follows the JSON schema and contains no extra text."
+        parse_failed = True
+        self.llm.discard_cached_response()
+        continue
+      status = response.get("status", "")
+      if status == "complete":
+        current_request = self.on_complete(context, response)
+        if current_request is None:
+          break
+      elif status == "need_more_info":
+        executed, rejected = run_commands(context, response.get("commands", []), self.log_name)
+        if rejected is not None:
+          current_request = f"{rejected}\n{task_request}"
+        if executed:
+          self.llm.clear_chat()
+      else:
+        context.write_text(self.log_name, f"Incorrect response status: {status}")
+        current_request = f"Invalid response status: {status}. Add 'status' field with value 'complete' or 'need_more_info'."
@@ -1,126 +1,64 @@
 from __future__ import annotations
-import json
 from pathlib import Path
 
-from orchestrator.llm import LLM, LLMConfig
-from orchestrator.task_logging import TaskLog
-from orchestrator.bash_tools import cat, ls, tree, grep
+from orchestrator.llm import LLM, LLMConfig, LLM_CACHE_DIR
 from orchestrator.agents.reviewer_prompt import SYSTEM_PROMPT
+from orchestrator.agents.reviewer_schema import JSON_SCHEMA
 from orchestrator.execution_context import Context
+from orchestrator.agents.exploring_agent import ExploringAgent
 
+REVIEW_REQUEST = (
+  "Review the proposed changes and produce concise, specific comments that point to exact "
+  "places in the diff (file path and line ranges). Follow the required JSON schema exactly."
+)
+_REQUIRED_COMMENT_KEYS = frozenset({"path", "start_line", "end_line", "comment", "severity"})
+_SEVERITIES = frozenset({"info", "warning", "error"})
 
-class Reviewer:
-  def __init__(self):
-    self.llm = LLM(LLMConfig(max_output_tokens=10000), SYSTEM_PROMPT)
 
-  def review_task(self, repo: Path, context: Context):
+class Reviewer(ExploringAgent):
+  log_name = "reviewer.txt"
+  final_log_name = "reviewer_final.txt"
+  exceeded_message = "Exceeded maximum number of steps without producing a valid review."
+
+  def __init__(self, use_cache: bool = True):
+    cfg = LLMConfig(max_output_tokens=10000, cache_dir=LLM_CACHE_DIR if use_cache else None, prompt_cache_key="orchestrator-reviewer")
+    super().__init__(LLM(cfg, SYSTEM_PROMPT, json_schema=JSON_SCHEMA, schema_name="review"))
 
-    step = -1
-    current_request = (
-      "Review the proposed changes and produce concise, specific comments that point to exact "
-      "places in the diff (file path and line ranges). Follow the required JSON schema exactly."
-    )
+  def review_task(self, repo: Path, context: Context):
+    self.run_loop(context, REVIEW_REQUEST)
 
-    while True:
-      if context.step > 40:
-        context.write_text("reviewer_final.txt", "Exceeded maximum number of steps without producing a valid review.")
-        break
-      try:
-        raw_response = self.llm.text(context.prompt_context, current_request)
-        response = json.loads(raw_response)
-        context.write_json("reviewer.txt", {"LLM Response": response})
-        step += 1
-      except json.JSONDecodeError as e:
-        context.write_text("reviewer.txt", f"Failed to parse LLM response as JSON: {e}\nResponse was:\n{raw_response}")
-        current_request = f"Failed to parse your response as JSON: {e}\nPlease ensure your response strictly follows the JSON schema and contains no extra text."
-        continue
-      status = response.get("status", "")
-      if status == "complete":
-        comments = response.get("comments", [])
-        invalid = None
-        if not isinstance(comments, list):
-          invalid = "'comments' must be a list"
-        else:
-          for i, c in enumerate(comments):
-            if not isinstance(c, dict):
-              invalid = f"Comment at index {i} is not an object"
-              break
-            required_keys = {"path", "start_line", "end_line", "comment", "severity"}
-            if not required_keys.issubset(set(c.keys())):
-              missing = required_keys - set(c.keys())
-              invalid = f"Comment at index {i} is missing keys: {sorted(list(missing))}"
-              break
-            if c.get("severity") not in ("info", "warning", "error"):
-              invalid = f"Invalid severity in comment at index {i}: {c.get('severity')}"
-              break
-            try:
-              int(c.get("start_line"))
-              int(c.get("end_line"))
-            except Exception:
-              invalid = f"start_line and end_line must be integers in comment at index {i}"
-              break
-        if invalid:
-          context.write_text("reviewer.txt", invalid)
-          current_request = f"{invalid}. Please return a JSON object strictly following the schema."
-          continue
-        context.write_json("reviewer_final.json", response)
-        summary = []
-        for c in comments:
-          if c["severity"] == "error":
-            summary.append(f"{c['path']}:{c['start_line']}-{c['end_line']} [{c['severity']}]: {c['comment']}")
-        context.prompt_context["REVIEW_SUMMARY"] = "\n".join(summary)
-        context.write_text("reviewer_final.txt", "\n".join(summary))
-        if not summary:
-          context.review_finished = True
-        break
-      elif status == "need_more_info":
-        for command in response.get("commands", []):
-          if command.startswith("ls "):
-            path = command[3:].strip()
-            command_result = ls(path)
-            context.prompt_context[f"LS_OUTPUT {path}"] = command_result
-            context.write_text("reviewer.txt", f"ls {path}\n{command_result}")
-            self.llm.clear_chat()
-          elif command.startswith("cat "):
-            path = command[4:].strip()
-            command_result = cat(path)
-            context.prompt_context[f"CAT_OUTPUT {path}"] = command_result
-            context.write_text("reviewer.txt", f"cat {path}\n{command_result}")
-            self.llm.clear_chat()
-          elif command.startswith("tree "):
-            parts = command[5:].strip().split()
-            if len(parts) != 2:
-              context.write_text("reviewer.txt", f"Invalid tree command: {command}")
-              current_request = f"Invalid tree command: {command}. Please use the format: tree <path> <depth>."
-              break
-            path, depth_str = parts
-            try:
-              depth = int(depth_str)
-            except ValueError:
-              context.write_text("reviewer.txt", f"Invalid depth in tree command: {command}")
-              current_request = f"Invalid depth in tree command: {command}. Depth must be an integer."
-              break
-            command_result = tree(path, depth)
-            context.prompt_context[f"TREE_OUTPUT {path} {depth}"] = command_result
-            context.write_text("reviewer.txt", f"tree {path} {depth}\n{command_result}")
-            self.llm.clear_chat()
-          elif command.startswith("grep "):
-            rest = command[5:].strip()
-            if not rest:
-              context.write_text("reviewer.txt", f"Invalid grep command: {command}")
-              current_request = f"Invalid grep command: {command}. Please use the format: grep <path> <pattern>."
-              break
-            parts = rest.split(maxsplit=1)
-            path = parts[0]
-            pattern = parts[1] if len(parts) > 1 else ""
-            command_result = grep(path, pattern)
-            context.prompt_context[f"GREP_OUTPUT {path} {pattern}"] = command_result
-            context.write_text("reviewer.txt", f"grep {path} {pattern}\n{command_result}")
-            self.llm.clear_chat()
-          else:
-            context.write_text("reviewer.txt", f"Invalid command: {command}")
-            current_request = f"Invalid command: {command}. Please use only the allowed commands: ls, cat, tree, grep."
-            break
-      else:
-        context.write_text("reviewer.txt", f"Incorrect response status: {status}")
-        current_request = f"Invalid response status: {status}. Add 'status' field with value 'complete' or 'need_more_info'."
+  def on_complete(self, context: Context, response: dict) -> str | None:
+    # the API enforces JSON_SCHEMA; the checks stay for endpoints that do not support strict output
+    comments = response.get("comments", [])
+    invalid = None
+    if not isinstance(comments, list):
+      invalid = "'comments' must be a list"
+    else:
+      for i, c in enumerate(comments):
+        if not isinstance(c, dict):
+          invalid = f"Comment at index {i} is not an object"
+          break
+        missing = _REQUIRED_COMMENT_KEYS - c.keys()
+        if missing:
+          invalid = f"Comment at index {i} is missing keys: {sorted(missing)}"
+          break
+        if c.get("severity") not in _SEVERITIES:
+          invalid = f"Invalid severity in comment at index {i}: {c.get('severity')}"
+          break
+        # bool is an int subclass, but true/false are not line numbers
+        if not all(isinstance(c[k], int) and not isinstance(c[k], bool) for k in ("start_line", "end_line")):
+          invalid = f"start_line and end_line must be integers in comment at index {i}"
+          break
+    if invalid:
+      context.write_text(self.log_name, invalid)
+      return f"{invalid}. Please return a JSON object strictly following the schema."
+    context.write_json("reviewer_final.json", response)
+    summary = []
+    for c in comments:
+      if c["severity"] == "error":
+        summary.append(f"{c['path']}:{c['start_line']}-{c['end_line']} [{c['severity']}]: {c['comment']}")
+    context.set_prompt_tail("REVIEW_SUMMARY", "\n".join(summary))
+    context.write_text(self.final_log_name, "\n".join(summary))
+    if not summary:
+      context.review_finished = True
+    return None
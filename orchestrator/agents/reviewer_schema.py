@@ -0,0 +1,26 @@
+JSON_SCHEMA = {
+  "$schema": "https://json-schema.org/draft/2020-12/schema",
+  "$id": "https://example.local/orchestrator/review.schema.json",
+  "type": "object",
+  "required": ["status", "comments", "commands"],
+  "additionalProperties": False,
+  "properties": {
+    "status": { "type": "string", "enum": ["complete", "need_more_info"] },
+    "comments": {
+      "type": "array",
+      "items": {
+        "type": "object",
+        "additionalProperties": False,
+        "required": ["path", "start_line", "end_line", "comment", "severity"],
+        "properties": {
+          "path": { "type": "string" },
+          "start_line": { "type": "integer" },
+          "end_line": { "type": "integer" },
+          "comment": { "type": "string" },
+          "severity": { "type": "string", "enum": ["info", "warning", "error"] }
+        }
+      }
+    },
+    "commands": { "type": "array", "items": { "type": "string" } }
+  }
+}
@@ -2,26 +2,31 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Any
-import yaml
 from orchestrator.llm import LLM
 from orchestrator.task_logging import TaskLog
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TechleadContext:
   """Контекст для работы техлида с документацией и беклогом."""
   docs_content: Dict[str, str]  # Имя файла -> содержимое
   repo_path: str
   total_docs: int
+  context_text: str  # документация и беклог для промпта, собирается один раз
 
 def create_techlead_context(context_data: Dict[str, str], repo: Path) -> TechleadContext:
   """Создает контекст техлида с собранной документацией и беклогом."""
+  context_text = "Current documentation and backlog:\n\n" + "".join(
+    f"=== {filename} ===\n{content}\n\n"
+    for filename, content in context_data.items()
+  )
   return TechleadContext(
     docs_content=context_data,
     repo_path=str(repo),
-    total_docs=len(context_data)
+    total_docs=len(context_data),
+    context_text=context_text
   )
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TechleadResult:
   """Результат работы техлида."""
   proposal_yaml: str
@@ -41,11 +46,6 @@ Rules:
 def run_techlead(llm: LLM, techlead_context: TechleadContext, log: TaskLog) -> str:
   """Запускает техлида для разбора задач на подзадачи."""
 
-  # Формируем контекст для техлида
-  context_text = "Current documentation and backlog:\n\n"
-  for filename, content in techlead_context.docs_content.items():
-    context_text += f"=== {filename} ===\n{content}\n\n"
-
   user_prompt = f"""Analyze the current backlog and break down large tasks into smaller subtasks if needed.
 
 Requirements:
@@ -54,7 +54,7 @@ Requirements:
 - Focus on keeping commits small and focused
 - Update backlog.yaml with new subtasks
 
-{context_text}
+{techlead_context.context_text}
 
 Generate a proposal to update the backlog with properly sized subtasks."""
 
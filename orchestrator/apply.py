@@ -1,14 +1,24 @@
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from orchestrator.proposals import Proposal
 
+MAX_WRITE_WORKERS = 8
+
+
+def _write_file(p: Path, content: str) -> None:
+  p.parent.mkdir(parents=True, exist_ok=True)
+  # bytes skip newline translation, so files get the same LF endings on every platform
+  p.write_bytes(content.encode("utf-8"))
 
 def apply_proposal(repo: Path, proposal: Proposal) -> list[str]:
-  written: list[str] = []
-  for f in proposal.files:
-    p = repo / f.path
-    p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_text(f.content, encoding="utf-8")
-    written.append(f.path)
-  return written
+  # the last entry for a path wins, as with sequential writes; distinct files are written concurrently
+  latest = {f.path: f.content for f in proposal.files}
+  if len(latest) > 1:
+    with ThreadPoolExecutor(max_workers=min(len(latest), MAX_WRITE_WORKERS)) as pool:
+      list(pool.map(lambda item: _write_file(repo / item[0], item[1]), latest.items()))
+  else:
+    for path, content in latest.items():
+      _write_file(repo / path, content)
+  return [f.path for f in proposal.files]
@@ -1,14 +1,73 @@
 import os
-import os
+import fnmatch
+import mmap
+import re
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from .runner import run_cmd, CmdError
 
 EXCLUDED_DIRS = ['.git', '.venv', 'logs', '__pycache__', '*.pyc', '*.egg-info']
+# exact names are a set lookup, the glob patterns are one compiled regex
+_EXCLUDED_NAMES = frozenset(ex for ex in EXCLUDED_DIRS if '*' not in ex and '?' not in ex)
+_EXCLUDED_GLOBS = re.compile("|".join(fnmatch.translate(ex) for ex in EXCLUDED_DIRS if ex not in _EXCLUDED_NAMES))
+# larger outputs keep only their head and tail, they are resent to the LLM on every step;
+# the omitted lines can be read with a ranged cat
+MAX_CAT_CHARS = 50_000
+MAX_TREE_ENTRIES = 200
+MAX_FS_CACHE_ENTRIES = 512
+GREP_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+MAX_GREP_MATCHES = 1_000
+# ripgrep is used for directory searches when installed; the in-process scan below is the fallback
+_RG = shutil.which("rg")
+_RG_EXCLUDE_ARGS = tuple(arg for ex in EXCLUDED_DIRS for arg in ("--glob", f"!{ex}"))
+GREP_TRUNCATED = f"... [stopped after {MAX_GREP_MATCHES} matches, narrow the path or the pattern]"
+TREE_TRUNCATED = "more entries omitted, narrow the path or depth]"
+
+# (tool, path, ..., st_mtime_ns[, st_size]) -> output; a modified file or directory gets a new key,
+# so entries never go stale. Module-level, so it is shared by all agents and review rounds.
+_fs_cache: dict[tuple, str] = {}
+# the tools run concurrently from run_commands; writes and evictions go through the lock, lookups are plain gets
+_fs_cache_lock = threading.Lock()
+
+def _fs_cache_put(key: tuple, output: str) -> str:
+  with _fs_cache_lock:
+    if len(_fs_cache) >= MAX_FS_CACHE_ENTRIES:
+      _fs_cache.pop(next(iter(_fs_cache)), None)
+    _fs_cache[key] = output
+  return output
+
+# one file-scan pool for all grep calls, so a batch of concurrent greps does not start a pool each
+_grep_pool: ThreadPoolExecutor | None = None
+_grep_pool_lock = threading.Lock()
+
+def _get_grep_pool() -> ThreadPoolExecutor:
+  global _grep_pool
+  with _grep_pool_lock:
+    if _grep_pool is None:
+      _grep_pool = ThreadPoolExecutor(max_workers=GREP_WORKERS, thread_name_prefix="grep")
+    return _grep_pool
+
+def _is_excluded(name: str) -> bool:
+  return name in _EXCLUDED_NAMES or _EXCLUDED_GLOBS.match(name) is not None
+
+@lru_cache(maxsize=8)
+def _real_cwd(cwd: str) -> str:
+  # keyed on os.getcwd(), so it stays correct when main chdirs into the target repo after import
+  return os.path.realpath(cwd)
 
 def _is_within_cwd(path: str) -> bool:
   try:
-    abs_path = os.path.realpath(path)
-    abs_cwd = os.path.realpath(os.getcwd())
+    # absolute paths elsewhere and '..' escapes are rejected lexically, before any symlink resolution
+    cwd = os.getcwd()
+    lexical = os.path.normpath(os.path.join(cwd, path))
+    if lexical != cwd and not lexical.startswith(cwd.rstrip(os.sep) + os.sep):
+      return False
+    # resolved on every check, never cached: a retargeted symlink must not keep an old answer
+    abs_path = os.path.realpath(os.path.join(cwd, path))
+    abs_cwd = _real_cwd(cwd)
     return abs_path.startswith(abs_cwd + os.sep) or abs_path == abs_cwd
   except (ValueError, OSError):
     return False
@@ -24,31 +83,76 @@ def ls(path: str) -> str:
     return "<FORBIDDEN>"
 
   try:
-    res = run_cmd(Path(os.getcwd()), ["ls", "-A", "-p", "-1", path])
-    lines = [l for l in res.stdout.splitlines()]
-  except CmdError as e:
-    # no access or other ls error
+    # a directory's mtime changes whenever an entry is added, removed or renamed
+    key = ("ls", path, os.path.realpath(path), os.stat(path).st_mtime_ns)
+  except OSError:
     return ""
+  cached = _fs_cache.get(key)
+  if cached is not None:
+    return cached
 
-  items = []
-  for item in lines:
-    item_clean = item.rstrip('/')
-    item_path = os.path.join(path, item_clean)
-    if any(excluded in item_path for excluded in EXCLUDED_DIRS):
-      continue
-    items.append(item)
-  return "\n".join(items)
+  # excluded directories (.git, logs, ...) list as empty, like before the per-name check
+  if any(_is_excluded(part) for part in Path(path).parts):
+    return _fs_cache_put(key, "")
+  try:
+    # same listing as `ls -A -p -1`: hidden entries included, directories marked with a slash
+    with os.scandir(path) as it:
+      items = sorted(e.name + "/" if e.is_dir(follow_symlinks=False) else e.name for e in it if not _is_excluded(e.name))
+  except OSError:
+    # no access or other listing error
+    return ""
+  return _fs_cache_put(key, "\n".join(items))
 
-def cat(path: str) -> str:
+def _truncate_middle(text: str, limit: int, path: str, first_line: int = 1) -> str:
+  if len(text) <= limit:
+    return text
+  # whole lines are kept from both ends; the marker names the omitted range so it can be read with a ranged cat
+  lines = text.splitlines(keepends=True)
+  budget = limit // 2
+  head, size = 0, 0
+  while head < len(lines) and size + len(lines[head]) <= budget:
+    size += len(lines[head])
+    head += 1
+  tail, size = len(lines), 0
+  while tail > head and size + len(lines[tail - 1]) <= budget:
+    tail -= 1
+    size += len(lines[tail])
+  start, end = first_line + head, first_line + tail - 1
+  marker = f"... [lines {start}-{end} omitted, read them with `cat {path} {start} {end}`] ...\n"
+  return "".join(lines[:head]) + marker + "".join(lines[tail:])
+
+def cat(path: str, first_line: int | None = None, last_line: int | None = None) -> str:
+  # with a range, returns only lines first_line..last_line (1-based, inclusive) of the file
   if not os.path.isfile(path):
     return "<FORBIDDEN>"
   if not _is_within_cwd(path):
     return "<FORBIDDEN>"
   try:
-    res = run_cmd(Path(os.getcwd()), ["cat", path])
-    return res.stdout
-  except CmdError:
+    st = os.stat(path)
+  except OSError:
+    return ""
+  # the requested path is part of the key: the truncation marker quotes it back to the caller
+  key = ("cat", path, os.path.realpath(path), st.st_mtime_ns, st.st_size, first_line, last_line)
+  cached = _fs_cache.get(key)
+  if cached is not None:
+    return cached
+  try:
+    with open(path, encoding="utf-8", errors="replace") as f:
+      content = f.read()
+  except OSError:
     return ""
+  if first_line is None:
+    return _fs_cache_put(key, _truncate_middle(content, MAX_CAT_CHARS, path))
+  # same line splitting as the hunk application in main, so the numbers match
+  selected = "".join(content.splitlines(keepends=True)[first_line - 1:last_line])
+  return _fs_cache_put(key, _truncate_middle(selected, MAX_CAT_CHARS, path, first_line))
+
+def _tree_entries(dir_path: str) -> list[os.DirEntry]:
+  try:
+    with os.scandir(dir_path) as it:
+      return sorted((e for e in it if not _is_excluded(e.name)), key=lambda e: e.name)
+  except OSError:
+    return []
 
 def tree(path: str, depth: int) -> str:
   if depth < 0:
@@ -58,107 +162,201 @@ def tree(path: str, depth: int) -> str:
   if not _is_within_cwd(path):
     return "<FORBIDDEN>"
 
-  # use find to enumerate entries, then build a similar tree output
-  try:
-    res = run_cmd(Path(os.getcwd()), ["find", path, "-print"])
-    paths = [p for p in res.stdout.splitlines()]
-  except CmdError:
-    return ""
-
-  # normalize and sort
-  root = Path(path)
-  entries = [Path(p) for p in paths]
-  entries.sort()
-
-  result_lines = []
-  # build directory-wise
-  dirs_seen = set()
-  for p in entries:
-    try:
-      rel = p.relative_to(root)
-    except Exception:
+  # depth-first, entries of each directory sorted by name, 4 spaces per level;
+  # directories at the depth limit are listed but not read
+  # the walk stops at the first entry past the cap, so the rest of the tree is never read
+  lines = [f"{os.path.basename(str(Path(path)))}/"]
+  stack = [iter(_tree_entries(path))] if depth > 0 else []
+  while stack:
+    e = next(stack[-1], None)
+    if e is None:
+      stack.pop()
       continue
-    # skip the root itself (will be handled below)
-    # filter directories by exact name and files by substring match as before
-    if p.is_dir():
-      name = p.name
-      if name in EXCLUDED_DIRS:
+    if len(lines) >= MAX_TREE_ENTRIES:
+      lines.append(f"... [{TREE_TRUNCATED}")
+      break
+    level = len(stack)
+    is_dir = e.is_dir(follow_symlinks=False)
+    lines.append("    " * level + (f"{e.name}/" if is_dir else e.name))
+    if is_dir and level < depth:
+      stack.append(iter(_tree_entries(e.path)))
+  return "\n".join(lines)
+
+# POSIX classes that have a direct Python equivalent inside a bracket expression
+_POSIX_CLASSES = {
+  "[:alpha:]": "a-zA-Z", "[:digit:]": "0-9", "[:alnum:]": "a-zA-Z0-9", "[:upper:]": "A-Z",
+  "[:lower:]": "a-z", "[:space:]": r"\s", "[:blank:]": r" \t", "[:xdigit:]": "0-9A-Fa-f",
+}
+
+# GNU word-boundary escapes; \b \B \w \W \s \S mean the same in Python and pass through as they are
+_GNU_ESCAPES = {"<": r"\b(?=\w)", ">": r"\b(?<=\w)"}
+
+def _posix_class_at(text: str, i: int) -> str | None:
+  return next((name for name in _POSIX_CLASSES if text.startswith(name, i)), None)
+
+def _bre_to_python(pattern: str) -> str:
+  # grep's default basic regex: ( ) { } | + ? are literal and only special when escaped (GNU),
+  # a leading * is literal, and a backslash inside [...] is an ordinary character
+  out = []
+  i, n = 0, len(pattern)
+  while i < n:
+    c = pattern[i]
+    if c == "\\" and i + 1 < n:
+      nxt = pattern[i + 1]
+      out.append(nxt if nxt in "(){}|+?" else _GNU_ESCAPES.get(nxt, c + nxt))
+      i += 2
+    elif c == "[":
+      j = i + 1
+      if j < n and pattern[j] == "^":
+        j += 1
+      if j < n and pattern[j] == "]":
+        j += 1
+      while j < n and pattern[j] != "]":
+        j += len(_posix_class_at(pattern, j) or "x")
+      if j >= n:
+        out.append("\\[")
+        i += 1
         continue
+      body = pattern[i + 1:j]
+      negate = body.startswith("^")
+      body = body[negate:]
+      parts = []
+      k = 0
+      while k < len(body):
+        cls = _posix_class_at(body, k)
+        if cls is not None:
+          parts.append(_POSIX_CLASSES[cls])
+          k += len(cls)
+        else:
+          parts.append("\\" + body[k] if body[k] in "\\[]^" and not (body[k] == "^" and k) else body[k])
+          k += 1
+      out.append("[" + "^" * negate + "".join(parts) + "]")
+      i = j + 1
     else:
-      if any(excluded in p.name for excluded in EXCLUDED_DIRS):
-        continue
-
-    # determine parent dir to print its header if not already
-    parent = p if p.is_dir() else p.parent
-    if parent not in dirs_seen:
-      # compute level for parent
-      if parent == root:
-        parent_level = 0
+      if c in "(){}|+?":
+        out.append("\\" + c)
+      elif c == "*" and (not out or out[-1] in ("^", "(", "|")):
+        out.append("\\*")
       else:
-        try:
-          rel_parent = parent.relative_to(root)
-          parent_level = len(rel_parent.parts)
-        except Exception:
-          parent_level = 0
-      if parent == root:
-        basename = os.path.basename(str(root))
-      else:
-        basename = parent.name
-      indent = " " * 4 * parent_level
-      result_lines.append(f"{indent}{basename}/")
-      dirs_seen.add(parent)
+        out.append(c)
+      i += 1
+  return "".join(out)
 
-    if p.is_dir():
-      continue
-    # file entry
-    if p.parent == root:
-      file_level = 0
-    else:
-      try:
-        rel_parent = p.parent.relative_to(root)
-        file_level = len(rel_parent.parts)
-      except Exception:
-        file_level = 0
-    indent = " " * 4 * file_level
-    result_lines.append(f"{indent}    {p.name}")
-
-  # Now filter out entries deeper than depth
-  filtered = []
-  for line in result_lines:
-    # count leading spaces to determine level
-    spaces = len(line) - len(line.lstrip(' '))
-    level = spaces // 4
-    if level > depth:
-      continue
-    filtered.append(line)
+def _grep_file(file_path: str, regex: re.Pattern, prefix: str, limit: int = MAX_GREP_MATCHES + 1) -> list[str]:
+  # up to limit lines of one file matching regex, as grep -n prints them; binary files are skipped like grep -I
+  try:
+    with open(file_path, "rb") as f:
+      if os.fstat(f.fileno()).st_size == 0:
+        return []
+      with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm.find(b"\0") != -1:
+          return []
+        matches = []
+        n = len(mm)
+        pos = 0
+        lineno, counted = 1, 0
+        while pos < n and len(matches) < limit:
+          m = regex.search(mm, pos)
+          if m is None:
+            break
+          start = mm.rfind(b"\n", 0, m.start()) + 1
+          if start >= n:
+            break
+          end = mm.find(b"\n", start)
+          if end == -1:
+            end = n
+          # grep matches line by line, so a match running over the line end does not count
+          if m.end() > end and regex.search(mm, start, end) is None:
+            pos = end + 1
+            continue
+          lineno += mm[counted:start].count(b"\n")
+          counted = start
+          line = mm[start:end].decode("utf-8", errors="replace").removesuffix("\r")
+          matches.append(f"{prefix}{lineno}:{line}")
+          pos = end + 1
+        return matches
+  except (OSError, ValueError):
+    return []
 
-  return "\n".join(filtered)
+def _grep_files(path: str) -> list[str]:
+  # the order of `rg --sort=path`: depth-first, files and subdirectories of each directory sorted
+  # together by name, so both backends keep the same matches when MAX_GREP_MATCHES cuts the output
+  files = []
+  stack = [iter(_tree_entries(path))]
+  while stack:
+    e = next(stack[-1], None)
+    if e is None:
+      stack.pop()
+    elif not e.is_dir():
+      files.append(e.path)
+    elif not e.is_symlink():
+      # like os.walk: symlinked directories are not followed, symlinked files are searched
+      stack.append(iter(_tree_entries(e.path)))
+  return files
 
 def grep(path: str, pattern: str) -> str:
   if not path:
     return "<FORBIDDEN>"
   if not _is_within_cwd(path):
     return "<FORBIDDEN>"
+  try:
+    regex = re.compile(_bre_to_python(pattern).encode("utf-8"), re.M)
+  except re.error:
+    # grep exits with 2 on a malformed pattern
+    return ""
 
-  # prepare exclude args
-  exclude_args = []
-  for ex in EXCLUDED_DIRS:
-    if '*' in ex or '?' in ex:
-      exclude_args += ["--exclude", ex]
-    else:
-      exclude_args += ["--exclude-dir", ex]
+  if os.path.isfile(path):
+    return _join_grep_matches(_grep_file(path, regex, ""))
+  if not os.path.isdir(path):
+    return "<FORBIDDEN>"
+  if _RG is not None:
+    matches = _rg_matches(path, regex.pattern.decode("utf-8"))
+    if matches is not None:
+      return _join_grep_matches(matches)
+  files = _grep_files(path)
+  scan = lambda file_path: _grep_file(file_path, regex, f"{file_path}:")
+  matches: list[str] = []
+  if len(files) < 8:
+    for file_path in files:
+      matches.extend(scan(file_path))
+      if len(matches) > MAX_GREP_MATCHES:
+        break
+    return _join_grep_matches(matches)
+  # overlaps opening and faulting in files on a cold cache; results are taken in the sorted file order
+  pool = _get_grep_pool()
+  futures = [pool.submit(scan, file_path) for file_path in files]
+  try:
+    for future in futures:
+      matches.extend(future.result())
+      if len(matches) > MAX_GREP_MATCHES:
+        break
+  finally:
+    # files not yet scanned when the cap is hit are skipped
+    for future in futures:
+      future.cancel()
+  return _join_grep_matches(matches)
 
+def _rg_matches(path: str, pattern: str) -> list[str] | None:
+  # same scope as the in-process scan: hidden and git-ignored files included, binaries skipped,
+  # files in path order; None when rg rejects the pattern (its regex dialect is a bit narrower)
+  cmd = [
+    _RG, "--no-config", "--line-number", "--with-filename", "--no-heading", "--color=never",
+    "--hidden", "--no-ignore", "--no-follow", "--sort=path", *_RG_EXCLUDE_ARGS, "-e", pattern, "--", path,
+  ]
   try:
-    if os.path.isfile(path):
-      cmd = ["grep", "-n", "-I", "--"] + [pattern, path]
-    elif os.path.isdir(path):
-      cmd = ["grep", "-R", "-n", "-I"] + exclude_args + ["--"] + [pattern, path]
-    else:
-      return "<FORBIDDEN>"
-    res = run_cmd(Path(os.getcwd()), cmd)
-    return res.stdout
-  except CmdError as e:
-    # grep exit code 1 == no matches
-    if hasattr(e, "result") and e.result.returncode == 1:
-      return ""
-    return ""
\ No newline at end of file
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, encoding="utf-8", errors="replace") as p:
+      matches = []
+      for line in p.stdout:
+        matches.append(line.rstrip("\n"))
+        if len(matches) > MAX_GREP_MATCHES:
+          p.kill()
+          return matches
+  except OSError:
+    return None
+  # exit code 1 means no matches, 2 is an error such as an unsupported pattern
+  return matches if p.returncode in (0, 1) else None
+
+def _join_grep_matches(matches: list[str]) -> str:
+  if len(matches) > MAX_GREP_MATCHES:
+    return "\n".join(matches[:MAX_GREP_MATCHES] + [GREP_TRUNCATED])
+  return "\n".join(matches)
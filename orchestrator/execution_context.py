@@ -1,22 +1,82 @@
+import queue
+import threading
+
+from orchestrator import json_io
 from orchestrator.task_logging import TaskLog
 
+# tool outputs are resent on every LLM call; past this size the oldest ones are dropped (~4 chars per token)
+MAX_PROMPT_CONTEXT_CHARS = 400_000
+TOOL_OUTPUT_PREFIXES = ("LS_OUTPUT ", "CAT_OUTPUT ", "TREE_OUTPUT ", "GREP_OUTPUT ")
+
 class Context:
-  def __init__(self, log: TaskLog):
+  def __init__(self, log: TaskLog, per_step_files: bool = False):
     self.log = log
     self.prompt_context :dict[str, str] = {}
     self.step = 0
     self.commit_message = None
     self.new_content = None
     self.review_finished = False
+    # by default every step is one line in a single journal; per-step files are handy for debugging
+    self.journal = None
+    if not per_step_files:
+      # records are serialized and written by a background thread, off the agent loop
+      self.journal = queue.SimpleQueue()
+      self._journal_file = log.open_append("session.jsonl")
+      self._journal_writer = threading.Thread(target=self._drain_journal, name="session-journal", daemon=True)
+      self._journal_writer.start()
 
   def write_text(self, filename: str, content: str):
-    self.log.write_text(f"{self.step}_{filename}", content)
+    if self.journal is None:
+      self.log.write_text(f"{self.step}_{filename}", content)
+    else:
+      self._write_record(filename, content)
     self.step += 1
 
   def write_json(self, filename: str, content):
-    self.log.write_json(f"{self.step}_{filename}", content)
+    if self.journal is None:
+      self.log.write_json(f"{self.step}_{filename}", content)
+    else:
+      self._write_record(filename, content)
     self.step += 1
 
+  def _write_record(self, filename: str, content):
+    self.journal.put((self.step, filename, content))
+
+  def _drain_journal(self):
+    # None is the stop marker put by close()
+    while True:
+      batch = [self.journal.get()]
+      while not self.journal.empty():
+        batch.append(self.journal.get_nowait())
+      self._journal_file.write("".join(
+        json_io.dumps({"step": step, "name": name, "content": content}) + "\n"
+        for step, name, content in filter(None, batch)
+      ))
+      if batch[-1] is None:
+        self._journal_file.close()
+        return
+
+  def close(self):
+    if self.journal is not None:
+      self.journal.put(None)
+      self._journal_writer.join()
+      self.journal = None
+
+  def set_prompt_tail(self, key: str, value: str):
+    # values that change between iterations go last, so the prefix sent to the LLM stays cacheable
+    self.prompt_context.pop(key, None)
+    self.prompt_context[key] = value
+
+  def trim_prompt_context(self):
+    # task, hunks and review summary always stay; an evicted command can simply be requested again
+    total = sum(len(v) for v in self.prompt_context.values())
+    if total <= MAX_PROMPT_CONTEXT_CHARS:
+      return
+    for key in [k for k in self.prompt_context if k.startswith(TOOL_OUTPUT_PREFIXES)]:
+      total -= len(self.prompt_context.pop(key))
+      if total <= MAX_PROMPT_CONTEXT_CHARS:
+        break
+
   def set_commit_candidate(self, message: str, new_content: list[dict[str, str]]):
     self.commit_message = message
     self.new_content = new_content
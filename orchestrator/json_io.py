@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+
+# orjson is an optional speedup (pip install orchestrator[speedups]); its JSONDecodeError
+# subclasses json.JSONDecodeError, so callers catch the same exception either way
+try:
+  import orjson
+except ImportError:
+  orjson = None
+
+JSONDecodeError = json.JSONDecodeError
+_decoder = json.JSONDecoder()
+
+
+def loads(data: str | bytes):
+  if orjson is not None:
+    return orjson.loads(data)
+  return json.loads(data)
+
+
+def loads_leading(data: str):
+  # parses the first JSON object in data and ignores text around it: a ```json fence, a sentence
+  # before or after it. Broken JSON itself is not repaired, that still goes back to the LLM.
+  try:
+    return loads(data)
+  except JSONDecodeError:
+    start = data.find("{")
+    if start == -1:
+      raise
+    return _decoder.raw_decode(data, start)[0]
+
+
+def dumps(obj) -> str:
+  # compact output, used for values that go back into the prompt
+  if orjson is not None:
+    return orjson.dumps(obj).decode("utf-8")
+  return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps_indented(obj) -> bytes:
+  # UTF-8 encoded, 2-space indented output for log files
+  if orjson is not None:
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+  return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
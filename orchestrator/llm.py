@@ -1,57 +1,216 @@
 from __future__ import annotations
+import hashlib
+import json
 import os
 from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import Iterator
 
 from openai import OpenAI
 from dotenv import load_dotenv
 
-load_dotenv()
+@cache
+def _load_env() -> None:
+  # read .env once, on first use rather than at import
+  load_dotenv()
+
+@cache
+def _shared_client(api_key: str) -> OpenAI:
+  # developer and reviewer share one connection pool, so keep-alive connections carry over between them
+  return OpenAI(api_key=api_key)
+
+# kept outside the target repo so cached responses never end up in its commits
+LLM_CACHE_DIR = Path.home() / ".cache" / "orchestrator" / "llm"
+# user/assistant pairs kept in the chat; past this the oldest turns after the first are dropped,
+# the first one usually carries the instructions and the output format
+MAX_CHAT_TURNS = 20
+
+# terminal stream events other than response.completed
+_STREAM_FAILURES = frozenset({"error", "response.failed", "response.incomplete"})
+
+def _stream_failure_reason(event) -> str:
+  if event.type == "error":
+    return getattr(event, "message", None) or "unknown error"
+  response = getattr(event, "response", None)
+  details = getattr(response, "incomplete_details", None) or getattr(response, "error", None)
+  return getattr(details, "reason", None) or getattr(details, "message", None) or "no details"
 
 
 @dataclass(frozen=True)
 class LLMConfig:
   model: str = "gpt-5-mini"  # поменяем позже вместе с архитектором
   max_output_tokens: int = 1200
+  cache_dir: Path | None = LLM_CACHE_DIR  # None disables the response cache
+  # routes requests sharing a prompt prefix to the same provider-side cache
+  prompt_cache_key: str | None = None
 
 
 class LLM:
-  def __init__(self, cfg: LLMConfig, system: str, json_schema: object = None):
+  def __init__(self, cfg: LLMConfig, system: str, json_schema: object = None, schema_name: str = "changeProposal"):
+    _load_env()
     api_key = os.environ.get("OPENAI_API_KEY")
     if not api_key:
       raise RuntimeError("OPENAI_API_KEY is not set")
-    self.client = OpenAI(api_key=api_key)
+    self.client = _shared_client(api_key)
     self.cfg = cfg
-    self.chat: list[dict[str, str]] = []
+    # completed (user, assistant) turns; a request that fails never gets in, so pairs stay aligned
+    self.chat: list[tuple[dict[str, str], dict[str, str]]] = []
+    self._pending_user: dict[str, str] | None = None
+    self.dropped_turns = 0  # turns dropped from the chat since the last clear_chat()
     self.system = {"role": "system", "content": system}
     self.json_schema = json_schema
+    self.schema_name = schema_name
+    self._last_cache_key: str | None = None
+    self._memo: dict[str, str] = {}  # in-process copy of the disk cache, saves re-reading on retries
+    # context key -> (value, rendered block); tool outputs only get appended, so most blocks are reused
+    self._context_blocks: dict[str, tuple[str, str]] = {}
+    self._last_context: tuple[list[str], str] = ([], "")  # blocks and joined message of the previous call
+
+  def text(self, context: dict[str, str], user: str, bypass_cache: bool = False) -> str:
+    input_chain, key = self._prepare(context, user)
+    output_message = None if bypass_cache else self._cache_get(key)
+    if output_message is None:
+      # Responses API
+      resp = self.client.responses.create(**self._request_args(input_chain))
+      # SDK convenience field: output_text
+      output_message = getattr(resp, "output_text", "") or ""
+      if output_message:
+        self._cache_put(key, output_message)
+    return self._finish(output_message)
+
+  def text_stream(self, context: dict[str, str], user: str, bypass_cache: bool = False) -> Iterator[str]:
+    # same as text(), but yields the response as it arrives; must be consumed to the end
+    input_chain, key = self._prepare(context, user)
+    cached = None if bypass_cache else self._cache_get(key)
+    if cached is not None:
+      yield cached
+      self._finish(cached)
+      return
+    parts: list[str] = []
+    completed = False
+    for event in self.client.responses.create(**self._request_args(input_chain), stream=True):
+      if event.type == "response.output_text.delta":
+        parts.append(event.delta)
+        yield event.delta
+      elif event.type == "response.completed":
+        completed = True
+      elif event.type in _STREAM_FAILURES:
+        # a cut-off response is neither cached nor added to the chat
+        raise RuntimeError(f"LLM stream ended with {event.type}: {_stream_failure_reason(event)}")
+    if not completed:
+      raise RuntimeError("LLM stream ended without response.completed")
+    output_message = "".join(parts)
+    if output_message:
+      self._cache_put(key, output_message)
+    self._finish(output_message)
+
+  def _prepare(self, context: dict[str, str], user: str) -> tuple[list[dict[str, str]], str]:
+    config_msg = self._render_context(context)
+    self._pending_user = {"role": "user", "content": user}
+    input_chain = [self.system, {"role": "user", "content": config_msg}]
+    for turn in self.chat:
+      input_chain.extend(turn)
+    input_chain.append(self._pending_user)
+    key = self._cache_key(input_chain)
+    self._last_cache_key = key
+    return input_chain, key
 
-  def text(self, context: dict[str, str], user: str) -> str:
-    config_msg = "\n".join(f"{k}:\n{v}" for k, v in context.items())
-    self.chat.append({"role": "user", "content": user})
-    input_chain = [
-      self.system,
-      {"role": "user", "content": config_msg},
-    ] + self.chat
-    # Responses API
-    resp = self.client.responses.create(
-      model=self.cfg.model,
-      input=input_chain,
-      max_output_tokens=self.cfg.max_output_tokens,
-      text={
+  def _render_context(self, context: dict[str, str]) -> str:
+    blocks = []
+    for k, v in context.items():
+      cached = self._context_blocks.get(k)
+      if cached is None or cached[0] is not v:
+        cached = (v, f"{k}:\n{v}")
+        self._context_blocks[k] = cached
+      blocks.append(cached[1])
+    if len(self._context_blocks) > len(context):
+      self._context_blocks = {k: b for k, b in self._context_blocks.items() if k in context}
+    # retries and repeated requests send an unchanged context; reuse the message instead of joining again
+    last_blocks, last_msg = self._last_context
+    if len(blocks) == len(last_blocks) and all(a is b for a, b in zip(blocks, last_blocks)):
+      return last_msg
+    msg = "\n".join(blocks)
+    self._last_context = (blocks, msg)
+    return msg
+
+  def _request_args(self, input_chain: list[dict[str, str]]) -> dict:
+    args = {
+      "model": self.cfg.model,
+      "input": input_chain,
+      "max_output_tokens": self.cfg.max_output_tokens,
+      "text": {
         "format": {
           "type": "json_schema",
-          "name": "changeProposal",
+          "name": self.schema_name,
           "schema": self.json_schema,
           "strict": True,
         } if self.json_schema else {"type": "text"},
       },
-    )
-    # SDK convenience field: output_text
-    output_message = getattr(resp, "output_text", "") or ""
+    }
+    if self.cfg.prompt_cache_key:
+      # sent as a raw body field so older SDK versions without the keyword still work
+      args["extra_body"] = {"prompt_cache_key": self.cfg.prompt_cache_key}
+    return args
+
+  def _finish(self, output_message: str) -> str:
     if output_message == "":
       print("Warning: LLM response is empty")
-    self.chat.append({"role": "assistant", "content": output_message})
+    self.chat.append((self._pending_user, {"role": "assistant", "content": output_message}))
+    self._pending_user = None
+    while len(self.chat) > MAX_CHAT_TURNS:
+      del self.chat[1]
+      self.dropped_turns += 1
     return output_message
 
   def clear_chat(self):
-    self.chat = []
+    self.chat.clear()
+    self.dropped_turns = 0
+
+  def discard_cached_response(self) -> None:
+    # called when the last response turned out to be unusable, so it is not replayed next run
+    p = self._cache_path(self._last_cache_key) if self._last_cache_key else None
+    if self._last_cache_key:
+      self._memo.pop(self._last_cache_key, None)
+    if p is not None:
+      p.unlink(missing_ok=True)
+
+  def _cache_key(self, input_chain: list[dict[str, str]]) -> str:
+    payload = json.dumps({
+      "model": self.cfg.model,
+      "max_output_tokens": self.cfg.max_output_tokens,
+      "json_schema": self.json_schema,
+      "input": input_chain,
+    }, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+  def _cache_path(self, key: str) -> Path | None:
+    if self.cfg.cache_dir is None:
+      return None
+    return self.cfg.cache_dir / key[:2] / f"{key}.txt"
+
+  def _cache_get(self, key: str) -> str | None:
+    p = self._cache_path(key)
+    if p is None:
+      return None
+    if key in self._memo:
+      return self._memo[key]
+    try:
+      text = p.read_text(encoding="utf-8")
+    except OSError:
+      return None
+    self._memo[key] = text
+    return text
+
+  def _cache_put(self, key: str, text: str) -> None:
+    p = self._cache_path(key)
+    if p is None:
+      return
+    self._memo[key] = text
+    try:
+      p.parent.mkdir(parents=True, exist_ok=True)
+      tmp = p.with_name(f"{p.name}.{os.getpid()}.tmp")
+      tmp.write_text(text, encoding="utf-8")
+      os.replace(tmp, p)
+    except OSError as e:
+      print(f"Warning: failed to write LLM cache entry: {e}")
@@ -6,30 +6,45 @@ import sys
 
 from orchestrator.task_logging import make_task_log_dir
 from orchestrator.execution_context import Context
-from orchestrator.agents.developer import Developer
-from orchestrator.agents.reviewer import Reviewer
 from orchestrator.git_ops import add_all, commit
 
 
 def parse_args() -> argparse.Namespace:
   p = argparse.ArgumentParser(prog="orchestrator")
   p.add_argument("--repo", required=True)
+  p.add_argument("--no-llm-cache", action="store_true", help="always query the LLM, ignoring cached responses")
+  p.add_argument("--per-step-logs", action="store_true", help="write every agent step to its own log file")
 
   return p.parse_args()
 
+PROJECT_CONTRACT_FILES = tuple(Path(p) for p in (
+  "docs/knowledge/facts.md",
+  "docs/tasks/backlog.yaml",
+  "docs/tasks/done.yaml",
+  "docs/tasks/problems.yaml",
+))
+
+def _dir_names(d: Path) -> set[str]:
+  try:
+    with os.scandir(d) as it:
+      return {e.name for e in it}
+  except OSError:
+    return set()
+
 def check_project_contract(repo: Path) -> None:
-  required = [
-    repo / "docs" / "knowledge" / "facts.md",
-    repo / "docs" / "tasks" / "backlog.yaml",
-    repo / "docs" / "tasks" / "done.yaml",
-    repo / "docs" / "tasks" / "problems.yaml",
-  ]
-
-  missing = [p for p in required if not p.exists()]
+  # one directory listing per parent instead of a stat per file
+  listings: dict[Path, set[str]] = {}
+  missing = []
+  for rel in PROJECT_CONTRACT_FILES:
+    names = listings.get(rel.parent)
+    if names is None:
+      names = listings[rel.parent] = _dir_names(repo / rel.parent)
+    if rel.name not in names:
+      missing.append(rel)
   if missing:
     print("[error] project does not satisfy orchestrator contract:", file=sys.stderr)
-    for p in missing:
-      print(f"  missing: {p.relative_to(repo)}", file=sys.stderr)
+    for rel in missing:
+      print(f"  missing: {rel}", file=sys.stderr)
     raise SystemExit(3)
 
 
@@ -53,19 +68,31 @@ def main() -> int:
   check_project_contract(repo)
   print("[ok] project contract valid")
 
+  # the agents pull in the openai SDK; importing them here keeps --help and the early checks fast
+  from orchestrator.agents.developer import Developer
+  from orchestrator.agents.reviewer import Reviewer
+
   log = make_task_log_dir(repo, "DEV")
-  context = Context(log)
-  dev = Developer()
+  context = Context(log, per_step_files=args.per_step_logs)
+  dev = Developer(use_cache=not args.no_llm_cache)
   print("What task should I do?")
+  # a piped task may span several lines, so take all of it; interactively it is one line
+  task = input() if sys.stdin.isatty() else sys.stdin.read()
+  # trailing whitespace and line endings are dropped so invisible differences still hit the LLM cache;
+  # line breaks and indentation are kept, a task may contain lists or code
   context.prompt_context = {
-    "TASK": input(),
+    "TASK": "\n".join(line.rstrip() for line in task.strip().splitlines()),
   }
-  dev.execute_task(repo, context)
-  rev = Reviewer()
-  rev.review_task(repo, context)
-  while not context.review_finished:
+  try:
     dev.execute_task(repo, context)
+    rev = Reviewer(use_cache=not args.no_llm_cache)
     rev.review_task(repo, context)
+    while not context.review_finished:
+      dev.execute_task(repo, context)
+      rev.review_task(repo, context)
+  finally:
+    # flushes the session journal also when an agent fails
+    context.close()
 
   hunks_by_file = {}
   for h in context.new_content:
@@ -74,9 +101,8 @@ def main() -> int:
     sorted_hunks = sorted(hunks, key=lambda h: h["old_start"], reverse=True)
     file_text = (repo / path).read_text().splitlines()
     for h in sorted_hunks:
-      before = file_text[:h["old_start"]]
-      after = file_text[h["old_start"] + h["old_len"]:]
-      file_text = before + h["lines"] + after
+      # applied bottom-up, so splicing in place keeps the earlier hunks' offsets valid
+      file_text[h["old_start"]:h["old_start"] + h["old_len"]] = h["lines"]
     (repo / path).write_text("\n".join(file_text))
 
   add_all(repo)
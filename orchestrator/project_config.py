@@ -2,22 +2,36 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 
-import yaml
+from orchestrator.yaml_io import safe_load
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CheckCmd:
   name: str
-  cmd: list[str]
+  cmd: tuple[str, ...]
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ProjectConfig:
-  checks: list[CheckCmd]
+  checks: tuple[CheckCmd, ...]
+
+# path -> (mtime_ns, size, parsed config); one entry per config file, replaced when the file changes
+_CONFIG_CACHE: dict[str, tuple[int, int, ProjectConfig]] = {}
+
+def clear_config_cache() -> None:
+  # for tests and long-lived callers that want the next load to re-read the file
+  _CONFIG_CACHE.clear()
 
 def load_project_config(repo: Path) -> ProjectConfig:
   p = repo / "docs" / "orchestrator.yaml"
-  if not p.exists():
-    raise FileNotFoundError(f"Missing project config: {p}")
-  data = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+  try:
+    st = p.stat()
+  except FileNotFoundError:
+    raise FileNotFoundError(f"Missing project config: {p}") from None
+  stamp = (st.st_mtime_ns, st.st_size)
+  cached = _CONFIG_CACHE.get(str(p))
+  if cached is not None and cached[:2] == stamp:
+    return cached[2]
+  with open(p, "rb") as fh:
+    data = safe_load(fh) or {}
   checks_raw = data.get("checks", []) or []
   checks: list[CheckCmd] = []
   for i, item in enumerate(checks_raw):
@@ -27,5 +41,8 @@ def load_project_config(repo: Path) -> ProjectConfig:
     cmd = list(item.get("cmd", []) or [])
     if not name or not cmd:
       raise ValueError(f"checks[{i}] must have name and cmd")
-    checks.append(CheckCmd(name=name, cmd=[str(x) for x in cmd]))
-  return ProjectConfig(checks=checks)
+    checks.append(CheckCmd(name=name, cmd=tuple(str(x) for x in cmd)))
+  # immutable all the way down, since the cached instance is shared by every caller
+  cfg = ProjectConfig(checks=tuple(checks))
+  _CONFIG_CACHE[str(p)] = (*stamp, cfg)
+  return cfg
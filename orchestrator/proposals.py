@@ -1,22 +1,28 @@
 from __future__ import annotations
+import os
 from dataclasses import dataclass
 from pathlib import Path
 
-import yaml
+from orchestrator.yaml_io import safe_load
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ProposedFile:
   path: str
   content: str
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Proposal:
   files: list[ProposedFile]
   problems: list[str]
 
 def parse_proposal_yaml(text: str) -> Proposal:
-  data = yaml.safe_load(text) or {}
+  return proposal_from_data(safe_load(text) or {})
+
+def proposal_from_data(data) -> Proposal:
+  # for callers that already have the parsed YAML; raises ValueError on a malformed proposal
+  if not isinstance(data, dict):
+    raise ValueError("proposal must be a mapping")
   pcs = data.get("proposed_changes", []) or []
   files: list[ProposedFile] = []
   for i, item in enumerate(pcs):
@@ -27,18 +33,29 @@ def parse_proposal_yaml(text: str) -> Proposal:
     if not path:
       raise ValueError(f"proposed_changes[{i}] missing path")
     files.append(ProposedFile(path=path, content=content))
-  probs = [str(x).strip() for x in (data.get("problems", []) or []) if str(x).strip()]
+  probs = [p for p in (str(x).strip() for x in (data.get("problems", []) or [])) if p]
   return Proposal(files=files, problems=probs)
 
+def _resolved(repo: Path, rel: str) -> str:
+  # symlinks are followed, as apply_proposal's writes follow them
+  return os.path.realpath(os.path.join(repo, rel))
+
+def _is_relative_inside(rel: str) -> bool:
+  # proposals name files relative to the repo; absolute paths and '..' segments are never legitimate
+  return not os.path.isabs(rel) and ".." not in rel.split(os.sep)
+
+def _is_under(path: str, root: str) -> bool:
+  return os.path.commonpath([path, root]) == root
+
 def validate_docs_only(repo: Path, proposal: Proposal) -> None:
+  docs_root = _resolved(repo, "docs")
   for f in proposal.files:
-    p = (repo / f.path).resolve()
-    if not str(p).startswith(str((repo / "docs").resolve())):
+    if not _is_relative_inside(f.path) or not _is_under(_resolved(repo, f.path), docs_root):
       raise ValueError(f"Proposed path outside docs/: {f.path}")
 
 def validate_allowed_prefixes(repo: Path, proposal: Proposal, prefixes: list[str]) -> None:
-  allowed_roots = [(repo / p).resolve() for p in prefixes]
+  allowed_roots = [_resolved(repo, p) for p in prefixes]
   for f in proposal.files:
-    p = (repo / f.path).resolve()
-    if not any(str(p).startswith(str(ar)) for ar in allowed_roots):
+    p = _resolved(repo, f.path)
+    if not _is_relative_inside(f.path) or not any(_is_under(p, ar) for ar in allowed_roots):
       raise ValueError(f"Proposed path not allowed: {f.path}")
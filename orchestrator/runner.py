@@ -2,10 +2,11 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 import subprocess
+from typing import Sequence
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CmdResult:
-  cmd: list[str]
+  cmd: Sequence[str]
   returncode: int
   stdout: str
   stderr: str
@@ -15,7 +16,7 @@ class CmdError(RuntimeError):
     super().__init__(f"Command failed: {result.cmd} (rc={result.returncode})")
     self.result = result
 
-def run_cmd(repo: Path, cmd: list[str]) -> CmdResult:
+def run_cmd(repo: Path, cmd: Sequence[str]) -> CmdResult:
   p = subprocess.run(cmd, cwd=str(repo), capture_output=True, text=True)
   res = CmdResult(cmd=cmd, returncode=p.returncode, stdout=p.stdout or "", stderr=p.stderr or "")
   if res.returncode != 0:
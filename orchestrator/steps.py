@@ -3,6 +3,9 @@ from dataclasses import dataclass
 from typing import Callable, Any
 from orchestrator.task_logging import TaskLog
 
+# command -> exit code; 0 means continue with the step
+_COMMANDS = {"next": 0, "abort": 130}
+
 
 @dataclass(frozen=True)
 class Step:
@@ -17,16 +20,25 @@ def run_step(step: Step, log: TaskLog, interactive: bool, index: int, total: int
   print(header)
   print(f"context: {step.context_summary}")
 
-  log.write_text(f"{index:02d}_{step.name}_meta.txt", header + "\n" + step.context_summary + "\n")
-
-  if interactive:
-    while True:
-      cmd = input("command (next/abort): ").strip().lower()
-      if cmd == "next":
-        break
-      if cmd == "abort":
-        raise SystemExit(130)
+  # meta and result go to one file; it is written even when the step is aborted or raises
+  meta = header + "\n" + step.context_summary + "\n"
+  result_text = "<step did not finish>"
+  try:
+    if interactive:
+      while True:
+        try:
+          cmd = input("command (next/abort): ").strip().lower()
+        except EOFError:
+          # closed stdin counts as abort rather than looping forever
+          raise SystemExit(130) from None
+        code = _COMMANDS.get(cmd)
+        if code == 0:
+          break
+        if code is not None:
+          raise SystemExit(code)
 
-  result = step.run()
-  log.write_text(f"{index:02d}_{step.name}_result.txt", str(result) if result is not None else "")
+    result = step.run()
+    result_text = str(result) if result is not None else ""
+  finally:
+    log.write_text(f"{index:02d}_{step.name}.txt", f"{meta}---RESULT---\n{result_text}")
   return result
@@ -2,7 +2,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
-import json
+from typing import TextIO
+
+from orchestrator import json_io
 
 @dataclass(frozen=True)
 class TaskLog:
@@ -12,9 +14,16 @@ class TaskLog:
     p = self.root / name
     p.write_text(text, encoding="utf-8")
 
+  def open_text(self, name: str) -> TextIO:
+    return (self.root / name).open("w", encoding="utf-8")
+
+  def open_append(self, name: str) -> TextIO:
+    # line-buffered, so each record reaches the file as soon as it is written
+    return (self.root / name).open("a", encoding="utf-8", buffering=1)
+
   def write_json(self, name: str, obj) -> None:
     p = self.root / name
-    p.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
+    p.write_bytes(json_io.dumps_indented(obj))
 
 def make_task_log_dir(project_repo: Path, task_id: str) -> TaskLog:
   logs_root = project_repo / "logs"
@@ -1,29 +1,45 @@
 from __future__ import annotations
+import os
 from pathlib import Path
 
-import yaml
+from orchestrator.yaml_io import safe_dump, safe_load
 
 
 def _read_yaml_list(p: Path):
-  if not p.exists():
+  try:
+    with open(p, "rb") as fh:
+      return safe_load(fh) or []
+  except FileNotFoundError:
     return []
-  data = yaml.safe_load(p.read_text(encoding="utf-8"))
-  return data or []
 
 
 def _write_yaml(p: Path, data) -> None:
-  p.write_text(yaml.safe_dump(data, sort_keys=False, allow_unicode=True), encoding="utf-8")
+  with open(p, "wb") as fh:
+    safe_dump(data, fh, sort_keys=False, allow_unicode=True, encoding="utf-8")
+
+
+def _append_yaml_item(p: Path, item: dict) -> None:
+  # a file written by _write_yaml is a block sequence, so the new item can be appended without reparsing it
+  fragment = safe_dump([item], sort_keys=False, allow_unicode=True).encode("utf-8")
+  try:
+    with open(p, "r+b") as fh:
+      if fh.read(2) == b"- ":
+        fh.seek(-1, os.SEEK_END)
+        if fh.read(1) == b"\n":
+          fh.write(fragment)
+          return
+  except FileNotFoundError:
+    pass
+  data = _read_yaml_list(p)
+  data.append(item)
+  _write_yaml(p, data)
 
 
 def append_done(repo: Path, task_id: str, title: str) -> None:
   p = repo / "docs" / "tasks" / "done.yaml"
-  data = _read_yaml_list(p)
-  data.append({"id": task_id, "title": title})
-  _write_yaml(p, data)
+  _append_yaml_item(p, {"id": task_id, "title": title})
 
 
 def append_problem(repo: Path, task_id: str, question: str, blocking: bool = True) -> None:
   p = repo / "docs" / "tasks" / "problems.yaml"
-  data = _read_yaml_list(p)
-  data.append({"task": task_id, "question": question, "blocking": blocking})
-  _write_yaml(p, data)
+  _append_yaml_item(p, {"task": task_id, "question": question, "blocking": blocking})
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import yaml
+
+# libyaml-backed loader/dumper when PyYAML was built with it, pure-Python otherwise
+try:
+  from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+  from yaml import SafeLoader, SafeDumper
+
+
+def safe_load(stream):
+  return yaml.load(stream, Loader=SafeLoader)
+
+
+def safe_dump(data, stream=None, **kwargs):
+  return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
@@ -0,0 +1,56 @@
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from orchestrator.agents.architect import ArchitectContext, run_architect_with_context
+from orchestrator.task_logging import TaskLog
+
+
+class FakeLLM:
+  dropped_turns = 0
+
+  def __init__(self, outputs):
+    self.outputs = list(outputs)
+    self.requests = []
+    self.bypassed = []
+    self.discarded = 0
+
+  def text_stream(self, context, user, bypass_cache=False):
+    self.requests.append(user)
+    self.bypassed.append(bypass_cache)
+    yield self.outputs.pop(0)
+
+  def discard_cached_response(self):
+    self.discarded += 1
+
+
+def _run(tmp_path, outputs):
+  llm = FakeLLM(outputs)
+  ctx = ArchitectContext(docs_content={}, repo_path=str(tmp_path), total_docs=0, docs_summary="")
+  result = run_architect_with_context(ctx, {"task_description": "task"}, llm, TaskLog(tmp_path))
+  return llm, result
+
+
+VALID = "proposed_changes:\n- path: docs/a.md\n  content: text\n"
+
+
+def test_invalid_proposal_is_retried_without_cache(tmp_path):
+  llm, result = _run(tmp_path, ["proposed_changes:\n- content: no path\n", VALID])
+  assert result.round_count == 2
+  assert result.proposal_yaml == VALID
+  assert "missing path" in llm.requests[1]
+  assert llm.bypassed == [False, True]
+  assert llm.discarded == 1
+  assert (tmp_path / "architect_round_1_error.txt").exists()
+
+
+def test_non_mapping_proposal_is_retried(tmp_path):
+  llm, result = _run(tmp_path, ["- just\n- a list\n", VALID])
+  assert result.round_count == 2
+  assert "must be a mapping" in llm.requests[1]
+
+
+def test_valid_proposal_is_returned_in_one_round(tmp_path):
+  llm, result = _run(tmp_path, [VALID])
+  assert result.round_count == 1
+  assert llm.discarded == 0
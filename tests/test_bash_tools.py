@@ -0,0 +1,81 @@
+import shutil
+
+import pytest
+
+from orchestrator import bash_tools
+from orchestrator.bash_tools import GREP_TRUNCATED, MAX_TREE_ENTRIES, TREE_TRUNCATED, cat, grep, tree
+
+
+def test_tree_stops_at_the_cap(tmp_path, monkeypatch):
+  for d in range(5):
+    sub = tmp_path / f"d{d}"
+    sub.mkdir()
+    for f in range(MAX_TREE_ENTRIES):
+      (sub / f"f{f:03}").write_text("")
+  monkeypatch.chdir(tmp_path)
+  read = []
+  entries = bash_tools._tree_entries
+  monkeypatch.setattr(bash_tools, "_tree_entries", lambda p: read.append(p) or entries(p))
+
+  lines = tree(".", 2).splitlines()
+
+  assert len(lines) == MAX_TREE_ENTRIES + 1
+  assert lines[-1] == f"... [{TREE_TRUNCATED}"
+  # the first subdirectory fills the cap, the ones after it are never scanned
+  assert read == [".", "./d0"]
+
+
+def test_tree_under_the_cap_has_no_marker(tmp_path, monkeypatch):
+  (tmp_path / "a").mkdir()
+  (tmp_path / "a" / "b.txt").write_text("")
+  monkeypatch.chdir(tmp_path)
+
+  assert tree(".", 2) == "./\n    a/\n        b.txt"
+
+
+def test_retargeted_symlink_is_rechecked(tmp_path, monkeypatch):
+  repo, outside = tmp_path / "repo", tmp_path / "outside"
+  repo.mkdir()
+  outside.mkdir()
+  (repo / "inside.txt").write_text("inside")
+  (outside / "secret.txt").write_text("secret")
+  link = repo / "link.txt"
+  link.symlink_to(repo / "inside.txt")
+  monkeypatch.chdir(repo)
+
+  assert cat("link.txt") == "inside"
+  link.unlink()
+  link.symlink_to(outside / "secret.txt")
+  assert cat("link.txt") == "<FORBIDDEN>"
+
+
+def test_cat_marker_names_the_requested_path(tmp_path, monkeypatch):
+  (tmp_path / "pkg").mkdir()
+  (tmp_path / "pkg" / "big.txt").write_text("".join(f"line {i}\n" for i in range(20_000)))
+  monkeypatch.chdir(tmp_path)
+
+  assert "`cat pkg/big.txt " in cat("pkg/big.txt")
+  # same file, so the same realpath, mtime and size; the marker must still quote this spelling
+  assert "`cat ./pkg/big.txt " in cat("./pkg/big.txt")
+
+
+def grep_tree(tmp_path):
+  # names chosen so that files and subdirectories interleave in the sorted order
+  for rel in ["a/1.txt", "b.txt", "c/1.txt", "c/d/1.txt", "e.txt", "f/1.txt"]:
+    p = tmp_path / rel
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text("match\n")
+  return ["./a/1.txt:1:match", "./b.txt:1:match", "./c/1.txt:1:match", "./c/d/1.txt:1:match"]
+
+
+@pytest.mark.parametrize("backend", ["python", "rg"])
+def test_grep_cap_keeps_the_same_matches_on_both_backends(tmp_path, monkeypatch, backend):
+  expected = grep_tree(tmp_path)
+  monkeypatch.chdir(tmp_path)
+  monkeypatch.setattr(bash_tools, "MAX_GREP_MATCHES", len(expected))
+  rg = shutil.which("rg") if backend == "rg" else None
+  if backend == "rg" and rg is None:
+    pytest.skip("ripgrep is not installed")
+  monkeypatch.setattr(bash_tools, "_RG", rg)
+
+  assert grep(".", "match").splitlines() == expected + [GREP_TRUNCATED]
@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+import pytest
+
+from orchestrator.llm import LLM, LLMConfig
+
+
+class FakeResponses:
+  def __init__(self, events):
+    self.events = events
+
+  def create(self, **kwargs):
+    assert kwargs["stream"] is True
+    return iter(self.events)
+
+
+def make_llm(monkeypatch, tmp_path, events) -> LLM:
+  monkeypatch.setenv("OPENAI_API_KEY", "test")
+  llm = LLM(LLMConfig(cache_dir=tmp_path), system="system")
+  llm.client = SimpleNamespace(responses=FakeResponses(events))
+  return llm
+
+
+def delta(text):
+  return SimpleNamespace(type="response.output_text.delta", delta=text)
+
+
+def test_incomplete_stream_is_not_cached(monkeypatch, tmp_path):
+  incomplete = SimpleNamespace(
+    type="response.incomplete",
+    response=SimpleNamespace(incomplete_details=SimpleNamespace(reason="max_output_tokens")),
+  )
+  llm = make_llm(monkeypatch, tmp_path, [delta("proposed_"), delta("chan"), incomplete])
+
+  with pytest.raises(RuntimeError, match="max_output_tokens"):
+    list(llm.text_stream({}, "request"))
+
+  assert llm._memo == {}
+  assert not list(tmp_path.rglob("*.txt"))
+  assert llm.chat == []
+
+
+def test_stream_without_completed_event_is_not_cached(monkeypatch, tmp_path):
+  llm = make_llm(monkeypatch, tmp_path, [delta("partial")])
+
+  with pytest.raises(RuntimeError):
+    list(llm.text_stream({}, "request"))
+
+  assert not list(tmp_path.rglob("*.txt"))
+
+
+def test_completed_stream_is_cached(monkeypatch, tmp_path):
+  llm = make_llm(monkeypatch, tmp_path, [delta("a: "), delta("1"), SimpleNamespace(type="response.completed")])
+
+  assert "".join(llm.text_stream({}, "request")) == "a: 1"
+
+  assert [p.read_text() for p in tmp_path.rglob("*.txt")] == ["a: 1"]
+  assert llm.chat[-1][1]["content"] == "a: 1"
@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+from orchestrator import project_config
+from orchestrator.project_config import CheckCmd, clear_config_cache, load_project_config
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+  clear_config_cache()
+  yield
+  clear_config_cache()
+
+
+def write_config(repo, cmd, mtime_ns):
+  p = repo / "docs" / "orchestrator.yaml"
+  p.parent.mkdir(exist_ok=True)
+  p.write_text(f"checks:\n  - name: test\n    cmd: [{cmd}]\n")
+  os.utime(p, ns=(mtime_ns, mtime_ns))
+
+
+def test_changed_config_replaces_its_cache_entry(tmp_path):
+  write_config(tmp_path, "pytest", 1_000_000_000)
+  first = load_project_config(tmp_path)
+  assert load_project_config(tmp_path) is first
+
+  write_config(tmp_path, "tox", 2_000_000_000)
+  assert load_project_config(tmp_path).checks == (CheckCmd(name="test", cmd=("tox",)),)
+  assert len(project_config._CONFIG_CACHE) == 1
+
+
+def test_clear_config_cache_forces_a_reload(tmp_path):
+  write_config(tmp_path, "pytest", 1_000_000_000)
+  first = load_project_config(tmp_path)
+
+  clear_config_cache()
+  assert load_project_config(tmp_path) is not first
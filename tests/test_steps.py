@@ -0,0 +1,30 @@
+import io
+
+import pytest
+
+from orchestrator.steps import Step, run_step
+from orchestrator.task_logging import TaskLog
+
+
+def make_step(ran):
+  return Step(name="build", actor="orchestrator", context_summary="build it", run=lambda: ran.append(True) or "done")
+
+
+def test_closed_stdin_aborts_the_step(tmp_path, monkeypatch):
+  monkeypatch.setattr("sys.stdin", io.StringIO(""))
+  ran = []
+
+  with pytest.raises(SystemExit) as exc:
+    run_step(make_step(ran), TaskLog(root=tmp_path), interactive=True, index=1, total=1)
+
+  assert exc.value.code == 130
+  assert ran == []
+  assert (tmp_path / "01_build.txt").read_text().endswith("<step did not finish>")
+
+
+def test_unknown_command_asks_again(tmp_path, monkeypatch):
+  monkeypatch.setattr("sys.stdin", io.StringIO("what\nNext\n"))
+  ran = []
+
+  assert run_step(make_step(ran), TaskLog(root=tmp_path), interactive=True, index=1, total=1) == "done"
+  assert ran == [True]